@@ -27,6 +27,7 @@ from wikidated._utils.misc import (
     external_process,
     hashcheck,
     hashsum,
+    iter_in_background_thread,
     months_between_dates,
     next_month,
 )
@@ -51,6 +52,7 @@ __all__ = [
     "external_process",
     "hashcheck",
     "hashsum",
+    "iter_in_background_thread",
     "months_between_dates",
     "next_month",
     "ParallelizeExitWorkerFunc",
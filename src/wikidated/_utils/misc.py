@@ -14,27 +14,35 @@
 # limitations under the License.
 #
 
+from __future__ import annotations
+
 from contextlib import contextmanager
 from datetime import date, timedelta
 from errno import EEXIST
 from itertools import islice
 from logging import getLogger
 from pathlib import Path
+from queue import Full, Queue
 from subprocess import PIPE, Popen, TimeoutExpired
+from threading import Event, Thread
 from typing import (
     IO,
     TYPE_CHECKING,
+    ContextManager,
     Iterable,
     Iterator,
     Optional,
     Sequence,
+    Tuple,
     TypeVar,
     Union,
+    cast,
+    overload,
 )
 
 import requests
 from tqdm import tqdm  # type: ignore
-from typing_extensions import Protocol
+from typing_extensions import Literal, Protocol
 
 _LOGGER = getLogger(__name__)
 
@@ -47,6 +55,74 @@ def chunked(iterable: Iterable[_T], size: int) -> Iterable[Sequence[_T]]:
     return iter(lambda: tuple(islice(iterator, size)), ())
 
 
+def iter_in_background_thread(
+    iterable: Iterable[_T], max_queued_items: int
+) -> Iterator[_T]:
+    # Consumes the iterable in a separate thread, so that producing the next items
+    # overlaps with whatever the caller does with the current one. At most
+    # max_queued_items produced items wait to be consumed. Exceptions raised while
+    # producing are re-raised in the consuming thread.
+    queue: Queue[Tuple[bool, object]] = Queue(maxsize=max_queued_items)
+    stop_producing = Event()
+    producer = Thread(
+        target=_produce_into_queue,
+        args=(iterable, queue, stop_producing),
+        daemon=True,
+    )
+    producer.start()
+    try:
+        while True:
+            is_item, value = queue.get()
+            if not is_item:
+                if value is not None:
+                    raise cast(BaseException, value)
+                return
+            yield cast(_T, value)
+    finally:
+        stop_producing.set()
+        producer.join()
+
+
+def _produce_into_queue(
+    iterable: Iterable[object],
+    queue: Queue[Tuple[bool, object]],
+    stop_producing: Event,
+) -> None:
+    # Queue entries are (True, item) for produced items and (False, None) or
+    # (False, exception) once producing has ended.
+    iterator = iter(iterable)
+    try:
+        for item in iterator:
+            if not _put_into_queue(queue, stop_producing, (True, item)):
+                return
+        _put_into_queue(queue, stop_producing, (False, None))
+    except BaseException as e:
+        _put_into_queue(queue, stop_producing, (False, e))
+    finally:
+        # If the consumer stopped early, close generators right away from this thread,
+        # so that they release their resources (e.g., external processes) before the
+        # consumer's join() returns instead of whenever they are garbage collected.
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            close()
+
+
+def _put_into_queue(
+    queue: Queue[Tuple[bool, object]],
+    stop_producing: Event,
+    entry: Tuple[bool, object],
+) -> bool:
+    # Time out regularly, so that a producer blocked on a full queue notices when the
+    # consumer stopped early.
+    while not stop_producing.is_set():
+        try:
+            queue.put(entry, timeout=0.1)
+            return True
+        except Full:
+            pass
+    return False
+
+
 def next_month(day: date) -> date:
     if day.month == 12:
         return date(year=day.year + 1, month=1, day=1)
@@ -159,14 +235,80 @@ def hashcheck(file: Union[Path, IO[bytes]], h: Hash, expected: str) -> None:
         )
 
 
+def _decode_output_line(line: Union[str, bytes]) -> str:
+    # Pipes of processes started with text=False yield bytes.
+    if isinstance(line, bytes):
+        return line.decode("UTF-8", errors="replace")
+    return line
+
+
 # Python 3.7 does not allow indexing Popen yet, but mypy requires it.
 if TYPE_CHECKING:
     Popen_str = Popen[str]
+    Popen_bytes = Popen[bytes]
 else:
     Popen_str = Popen
+    Popen_bytes = Popen
+
+
+@overload
+def external_process(
+    args: Sequence[str],
+    *,
+    stdin: Optional[int],
+    stdout: Optional[int],
+    stderr: Optional[int],
+    cwd: Optional[Path] = None,
+    bufsize: int = -1,
+    text: Literal[True] = True,
+    name: Optional[str] = None,
+    exhaust_stdout_to_log: bool = False,
+    exhaust_stderr_to_log: bool = False,
+    terminate_timeout: Optional[float] = 1,
+    check_return_code_zero: bool = False,
+) -> ContextManager[Popen_str]:
+    ...
+
+
+@overload
+def external_process(
+    args: Sequence[str],
+    *,
+    stdin: Optional[int],
+    stdout: Optional[int],
+    stderr: Optional[int],
+    cwd: Optional[Path] = None,
+    bufsize: int = -1,
+    text: Literal[False],
+    name: Optional[str] = None,
+    exhaust_stdout_to_log: bool = False,
+    exhaust_stderr_to_log: bool = False,
+    terminate_timeout: Optional[float] = 1,
+    check_return_code_zero: bool = False,
+) -> ContextManager[Popen_bytes]:
+    ...
+
+
+@overload
+def external_process(
+    args: Sequence[str],
+    *,
+    stdin: Optional[int],
+    stdout: Optional[int],
+    stderr: Optional[int],
+    cwd: Optional[Path] = None,
+    bufsize: int = -1,
+    text: bool,
+    name: Optional[str] = None,
+    exhaust_stdout_to_log: bool = False,
+    exhaust_stderr_to_log: bool = False,
+    terminate_timeout: Optional[float] = 1,
+    check_return_code_zero: bool = False,
+) -> ContextManager[Union[Popen_str, Popen_bytes]]:
+    ...
 
 
-@contextmanager
+@contextmanager  # type: ignore[misc]
 def external_process(
     args: Sequence[str],
     *,
@@ -174,12 +316,14 @@ def external_process(
     stdout: Optional[int],
     stderr: Optional[int],
     cwd: Optional[Path] = None,
+    bufsize: int = -1,
+    text: bool = True,
     name: Optional[str] = None,
     exhaust_stdout_to_log: bool = False,
     exhaust_stderr_to_log: bool = False,
     terminate_timeout: Optional[float] = 1,
     check_return_code_zero: bool = False,
-) -> Iterator[Popen_str]:
+) -> Iterator[Union[Popen_str, Popen_bytes]]:
     if name is None:
         name = args[0]
         _LOGGER.debug(f"Starting external process '{' '.join(args)}'")
@@ -187,7 +331,14 @@ def external_process(
         _LOGGER.debug(f"Starting external process {name}: '{' '.join(args)}'")
 
     process = Popen(
-        args, stdin=stdin, stdout=stdout, stderr=stderr, cwd=cwd, encoding="UTF-8"
+        args,
+        bufsize=bufsize,
+        stdin=stdin,
+        stdout=stdout,
+        stderr=stderr,
+        cwd=cwd,
+        # Without an encoding, the pipes are binary, i.e., yield bytes instead of str.
+        encoding="UTF-8" if text else None,
     )
 
     try:
@@ -202,13 +353,13 @@ def external_process(
             assert stdout == PIPE
             assert process.stdout is not None
             for line in process.stdout:
-                _LOGGER.debug(f"{name}: {line.rstrip()}")
+                _LOGGER.debug(f"{name}: {_decode_output_line(line).rstrip()}")
 
         if exhaust_stderr_to_log:
             assert stderr == PIPE
             assert process.stderr is not None
             for line in process.stderr:
-                _LOGGER.error(f"{name}: {line.rstrip()}")
+                _LOGGER.error(f"{name}: {_decode_output_line(line).rstrip()}")
 
         process.terminate()
         try:
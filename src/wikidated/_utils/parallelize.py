@@ -16,10 +16,10 @@
 
 from __future__ import annotations
 
-import atexit
 from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
 from logging import getLogger
 from multiprocessing import Manager, cpu_count
+from multiprocessing.util import Finalize  # type: ignore
 from typing import (
     Collection,
     Iterable,
@@ -181,7 +181,10 @@ def _init_worker_wrapper(
         global _EXTRA_ARGUMENTS_FROM_INIT_FUNC
         _EXTRA_ARGUMENTS_FROM_INIT_FUNC = init_worker_func()
     if exit_worker_func is not None:
-        atexit.register(exit_worker_func)
+        # Worker processes end via os._exit() and therefore never run atexit handlers.
+        # They do however run multiprocessing's finalizers before exiting, which is
+        # what ProcessPoolExecutor.shutdown() waits for.
+        Finalize(None, exit_worker_func, exitpriority=0)
 
 
 def _func_wrapper(
@@ -22,9 +22,18 @@ from os.path import relpath
 from pathlib import Path
 from shutil import rmtree
 from subprocess import DEVNULL, PIPE
-from typing import IO, Any, Callable, Iterator, Optional
-
-from typing_extensions import Final, Protocol
+from typing import (
+    IO,
+    Any,
+    Callable,
+    ContextManager,
+    Iterator,
+    Optional,
+    Union,
+    overload,
+)
+
+from typing_extensions import Final, Literal, Protocol
 
 from wikidated._utils.misc import external_process
 
@@ -73,15 +82,22 @@ class SevenZipArchive:
         files.sort(key=key)
         ordered_filename_num_digits = len(str(len(files) - 1))
 
+        # Resolving every file separately would walk and stat all components of its
+        # path again, which adds up for directories with hundreds of thousands of files.
+        dir_resolved = dir_.resolve()
+
         tmp_dir.mkdir(exist_ok=False, parents=True)
         with listfile_rename.open("w", encoding="UTF-8") as fout:
             for i, file in enumerate(files):
                 ordered_filename = f"{i:0{ordered_filename_num_digits}d}"
                 fout.write(f"{ordered_filename}\n{file.name}\n")
-                (tmp_dir / ordered_filename).symlink_to(file.resolve())
+                (tmp_dir / ordered_filename).symlink_to(dir_resolved / file.name)
 
         if tmp_path.exists():
             tmp_path.unlink()
+        # Archives are created non-solid (-ms=off), i.e., each file is compressed on its
+        # own. Extracting a single file then only needs to decompress that file, instead
+        # of all files stored before it in the same solid block.
         with external_process(
             ("7z", "a", "-l", "-ms=off", relpath(tmp_path, tmp_dir), "."),
             stdin=DEVNULL,
@@ -114,6 +130,30 @@ class SevenZipArchive:
 
     @contextmanager
     def write(self, file_name: Optional[Path] = None) -> Iterator[IO[str]]:
+        with self._write(file_name, text=True) as fd:
+            yield fd
+
+    @contextmanager
+    def write_bytes(self, file_name: Optional[Path] = None) -> Iterator[IO[bytes]]:
+        with self._write(file_name, text=False) as fd:
+            yield fd
+
+    @overload
+    def _write(
+        self, file_name: Optional[Path], *, text: Literal[True]
+    ) -> ContextManager[IO[str]]:
+        ...
+
+    @overload
+    def _write(
+        self, file_name: Optional[Path], *, text: Literal[False]
+    ) -> ContextManager[IO[bytes]]:
+        ...
+
+    @contextmanager  # type: ignore[misc]
+    def _write(
+        self, file_name: Optional[Path], *, text: bool
+    ) -> Iterator[Union[IO[str], IO[bytes]]]:
         # This method seems to take longer the more file already exist in the archive.
         # If you plan want to create archives with many files, it is better to just
         # create a directory with all files in it as you need them, and then to convert
@@ -128,6 +168,11 @@ class SevenZipArchive:
             stdin=PIPE,
             stdout=PIPE,
             stderr=PIPE,
+            # Same as for reading, a larger buffer than the default 8 KiB collects many
+            # small writes, e.g., one per revision, into fewer write() syscalls on the
+            # pipe and in turn fewer wake-ups of the 7z compressor.
+            bufsize=128 * 1024,
+            text=text,
             exhaust_stdout_to_log=True,
             exhaust_stderr_to_log=True,
             check_return_code_zero=True,
@@ -137,6 +182,32 @@ class SevenZipArchive:
 
     @contextmanager
     def read(self, file_name: Optional[Path] = None) -> Iterator[IO[str]]:
+        with self._read(file_name, text=True) as fd:
+            yield fd
+
+    @contextmanager
+    def read_bytes(self, file_name: Optional[Path] = None) -> Iterator[IO[bytes]]:
+        # Reading the raw bytes avoids decoding all output through a TextIOWrapper for
+        # consumers that can parse bytes themselves, e.g., JSON parsers.
+        with self._read(file_name, text=False) as fd:
+            yield fd
+
+    @overload
+    def _read(
+        self, file_name: Optional[Path], *, text: Literal[True]
+    ) -> ContextManager[IO[str]]:
+        ...
+
+    @overload
+    def _read(
+        self, file_name: Optional[Path], *, text: Literal[False]
+    ) -> ContextManager[IO[bytes]]:
+        ...
+
+    @contextmanager  # type: ignore[misc]
+    def _read(
+        self, file_name: Optional[Path], *, text: bool
+    ) -> Iterator[Union[IO[str], IO[bytes]]]:
         if file_name:
             _LOGGER.debug(f"Reading file {file_name} from 7z archive {self.path}.")
         else:
@@ -146,11 +217,15 @@ class SevenZipArchive:
         # processing output from stdout, before the full archive if depleted). Waiting
         # for output on stderr stalls the process. Terminating while output in stdout is
         # still being generated results in a -15 return code.
+        # The default pipe buffer of 8 KiB means a read() syscall for every few lines
+        # of the decompressed output, so we use a larger 128 KiB buffer instead.
         with external_process(
             ("7z", "x", "-so", str(self.path), file_name_str),
             stdin=DEVNULL,
             stdout=PIPE,
             stderr=PIPE,
+            bufsize=128 * 1024,
+            text=text,
         ) as seven_zip_process:
             assert seven_zip_process.stdout is not None
             yield seven_zip_process.stdout
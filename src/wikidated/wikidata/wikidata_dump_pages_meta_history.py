@@ -15,7 +15,7 @@
 #
 
 import re
-from datetime import date, datetime
+from datetime import date, datetime, timezone
 from itertools import chain
 from logging import getLogger
 from pathlib import Path
@@ -211,6 +211,23 @@ class WikidataDumpPagesMetaHistory(WikidataDumpFile):
                 text=text,
             )
 
+    @classmethod
+    def _parse_timestamp(cls, value: str) -> datetime:
+        # MediaWiki always writes timestamps in UTC as, e.g., "2012-10-29T17:47:05Z".
+        # Slicing that fixed layout is about three times faster than strptime(), which
+        # matters as this is done for every single revision.
+        if len(value) == 20 and value[19] == "Z":
+            return datetime(
+                int(value[0:4]),
+                int(value[5:7]),
+                int(value[8:10]),
+                int(value[11:13]),
+                int(value[14:16]),
+                int(value[17:19]),
+                tzinfo=timezone.utc,
+            )
+        return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S%z")
+
     @classmethod
     def _process_revision(
         cls, lines: Iterator[str]
@@ -225,9 +242,7 @@ class WikidataDumpPagesMetaHistory(WikidataDumpFile):
         else:
             lines = chain((line,), lines)
 
-        timestamp = datetime.strptime(
-            cls._extract_value(next(lines), "timestamp"), "%Y-%m-%dT%H:%M:%S%z"
-        )
+        timestamp = cls._parse_timestamp(cls._extract_value(next(lines), "timestamp"))
 
         contributor: Optional[str] = None
         contributor_id: Optional[int] = None
@@ -274,8 +289,11 @@ class WikidataDumpPagesMetaHistory(WikidataDumpFile):
 
         cls._assert_closing_tag(next(lines), "revision")
 
+        # The values have already been converted to their proper types above, so we
+        # skip Pydantic's validation for this intermediate object. The fields are
+        # validated once when they are copied into the final WikidataRawRevision.
         return (
-            WikidataRevisionMetadata(
+            WikidataRevisionMetadata.construct(
                 revision_id=revision_id,
                 parent_revision_id=parent_revision_id,
                 timestamp=timestamp,
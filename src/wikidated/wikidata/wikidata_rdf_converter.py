@@ -14,10 +14,21 @@
 # limitations under the License.
 #
 
-from typing import NamedTuple, Optional, Sequence
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import (
+    Callable,
+    Mapping,
+    MutableMapping,
+    MutableSequence,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 from jpype import JClass, JException, JObject  # type: ignore
-from marisa_trie import Trie  # type: ignore
 
 from wikidated._utils import JvmManager
 from wikidated.wikidata.wikidata_dump_pages_meta_history import WikidataRawRevision
@@ -61,7 +72,49 @@ WIKIDATA_RDF_PREFIXES = {
     "http://www.wikidata.org/value/": "wdv",
     "http://www.wikidata.org/wiki/Special:EntityData/": "wdata",
 }
-_WIKIDATA_RDF_PREFIXES_TRIE = Trie(WIKIDATA_RDF_PREFIXES.keys())
+
+
+def _build_prefixes_pattern(
+    prefixes: Sequence[Tuple[str, str]], num_matched_chars: int = 0
+) -> str:
+    # Builds a regex that has the structure of a trie over the given prefix IRIs, all of
+    # which share their first num_matched_chars characters. That way, matching an IRI
+    # only has to follow a single branch instead of trying every prefix one after the
+    # other. The prefix that ends at a node is only tried after all longer prefixes,
+    # so the match is always the longest one. Named groups labeled with the respective
+    # short prefix mark where a prefix ends.
+    prefixes_by_next_char: MutableMapping[str, MutableSequence[Tuple[str, str]]] = {}
+    prefix_ending_here: Optional[str] = None
+    for prefix_iri, prefix in prefixes:
+        if len(prefix_iri) == num_matched_chars:
+            prefix_ending_here = prefix
+        else:
+            next_char = prefix_iri[num_matched_chars]
+            prefixes_by_next_char.setdefault(next_char, []).append((prefix_iri, prefix))
+
+    alternatives = [
+        re.escape(next_char)
+        + _build_prefixes_pattern(prefixes_with_next_char, num_matched_chars + 1)
+        for next_char, prefixes_with_next_char in prefixes_by_next_char.items()
+    ]
+    if prefix_ending_here is not None:
+        alternatives.append(f"(?P<{prefix_ending_here}>)")
+    if len(alternatives) == 1:
+        return alternatives[0]
+    return "(?:" + "|".join(alternatives) + ")"
+
+
+# Matches any of the above prefixes at the start of an IRI in N-Triples notation (i.e.,
+# still enclosed in angle brackets). The name of the matched group is the short prefix.
+_WIKIDATA_RDF_PREFIXES_PATTERN = re.compile(
+    "<" + _build_prefixes_pattern(list(WIKIDATA_RDF_PREFIXES.items()))
+)
+
+# The JSON of redirects only consists of the source and target entity IDs, e.g.,
+# {"entity":"Q1234","redirect":"Q5678"}, so the "redirect" key always occurs right at
+# the start. Only searching that far avoids scanning the full JSON of every other
+# revision, which can be hundreds of kilobytes long.
+_REDIRECT_KEY_SEARCH_LENGTH = 128
 
 
 class WikidataRdfTriple(NamedTuple):
@@ -79,24 +132,34 @@ class WikidataRdfTriple(NamedTuple):
     # generation, blank nodes only occur in the object position and are never reused.
     # This allows us to treat two triples as equal, if a blank nodes occurs in the
     # object position of both and if subject and predicate are equal to each other.
+    #
+    # Both methods are called for every triple that is put into a set, so they test
+    # for blank nodes by comparing only a one-character slice with "_": In N-Triples,
+    # nothing but a blank node label ("_:...") can start with an underscore. Unlike
+    # indexing, the slice is also safe for an empty object, and CPython returns cached
+    # one-character strings for it, so unlike a two-character slice it does not
+    # allocate a new string.
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, WikidataRdfTriple):
             return False
-        if self.object_[:2] == "_:" and other.object_[:2] == "_:":
-            return self.subject == other.subject and self.predicate == other.predicate
-        else:
-            return (
-                self.subject == other.subject
-                and self.predicate == other.predicate
-                and self.object_ == other.object_
-            )
+        # Sets only compare triples with equal hashes, which nearly always are equal
+        # element by element. Check that first via tuple's C implementation and only
+        # fall back to the blank node comparison if it fails.
+        if tuple.__eq__(self, other):
+            return True
+        return (
+            self.object_[:1] == "_"
+            and other.object_[:1] == "_"
+            and self.subject == other.subject
+            and self.predicate == other.predicate
+        )
 
     def __hash__(self) -> int:
-        if self.object_[:2] == "_:":
-            return hash((self.subject, self.predicate, "_:"))
-        else:
-            return hash((self.subject, self.predicate, self.object_))
+        object_ = self.object_
+        return hash(
+            (self.subject, self.predicate, "_:" if object_[:1] == "_" else object_)
+        )
 
 
 class WikidataRdfRevision(WikidataRevisionBase):
@@ -130,23 +193,48 @@ class WikidataRdfConverter:
         self._wdtk_json_deserializer = JClass(
             "org.wikidata.wdtk.datamodel.helpers.JsonDeserializer"
         )(JClass("org.wikidata.wdtk.datamodel.helpers.Datamodel").SITE_WIKIDATA)
+        # Resolve the deserialization methods once, so that choosing the one to use
+        # for a revision is only a dict lookup by the revision's Wikibase model.
+        self._wdtk_deserialize_redirect = (
+            self._wdtk_json_deserializer.deserializeEntityRedirectDocument
+        )
+        self._wdtk_deserialize_by_wikibase_model: Mapping[
+            str, Callable[[str], JObject]
+        ] = {
+            "wikibase-item": self._wdtk_json_deserializer.deserializeItemDocument,
+            "wikibase-property": (
+                self._wdtk_json_deserializer.deserializePropertyDocument
+            ),
+        }
+
+        # The bytes buffer that the RDF is written into can be reused across revisions
+        # (and closing it has no effect). Keeping it also keeps its grown capacity.
+        self._wdtk_output_stream = JClass("java.io.ByteArrayOutputStream")()
 
         # Lookup Java classes needed to access WDTK's RDF serialization.
-        self._wdtk_output_stream = JClass("java.io.ByteArrayOutputStream")
         self._wdtk_rdf_writer = JClass("org.wikidata.wdtk.rdf.RdfWriter")
         self._wdtk_rdf_converter = JClass("org.wikidata.wdtk.rdf.RdfConverter")
 
+        # Static fields of Java classes are looked up via JPype on every access, so
+        # resolve the ones needed for every revision only once.
+        self._wdtk_wb_item = self._wdtk_rdf_writer.WB_ITEM
+        self._wdtk_wb_property = self._wdtk_rdf_writer.WB_PROPERTY
+
         # Load objects that are needed to construct the above classes.
         self._wdtk_ntriples_format = JClass("org.eclipse.rdf4j.rio.RDFFormat").NTRIPLES
-        self._wdtk_sites = self._load_wdtk_sites(sites_table)
+        self._wdtk_sites = self._load_wdtk_sites(sites_table.path)
         self._wdtk_property_register = JClass(
             "org.wikidata.wdtk.rdf.PropertyRegister"
         ).getWikidataPropertyRegister()
 
+    # Parsing the sites table takes a while and its result is only ever read, so all
+    # converters in the same process (i.e., the same JVM) share a single Sites object.
+    # Sharing it across processes is not possible, as it lives in each process's JVM.
     @classmethod
-    def _load_wdtk_sites(cls, sites_table: WikidataDumpSitesTable) -> JObject:
+    @lru_cache(maxsize=None)
+    def _load_wdtk_sites(cls, sites_table_path: Path) -> JObject:
         dump = JClass("org.wikidata.wdtk.dumpfiles.MwLocalDumpFile")(
-            str(sites_table.path)
+            str(sites_table_path)
         )
         processor = JClass("org.wikidata.wdtk.dumpfiles.MwSitesDumpFileProcessor")()
         processor.processDumpFileContents(dump.getDumpFileStream(), dump)
@@ -167,9 +255,11 @@ class WikidataRdfConverter:
         # TODO: document that RdfConverter basically only adds the "TASK filtering" on
         #  top of AbstractRdfConverter.
 
-        wdtk_output_stream = self._wdtk_output_stream()
+        # A new RdfWriter is needed per revision, since RdfWriter.finish() ends the RDF
+        # document and the writer can not be started again afterwards.
+        self._wdtk_output_stream.reset()
         wdtk_rdf_writer = self._wdtk_rdf_writer(
-            self._wdtk_ntriples_format, wdtk_output_stream
+            self._wdtk_ntriples_format, self._wdtk_output_stream
         )
         wdtk_rdf_writer.start()
         wdtk_rdf_converter = self._wdtk_rdf_converter(
@@ -183,40 +273,14 @@ class WikidataRdfConverter:
             wdtk_rdf_converter.writeNamespaceDeclarations()
             wdtk_rdf_converter.writeBasicDeclarations()
 
-        wdtk_document = self._load_wdtk_document(revision)
-        wdtk_document_class = str(wdtk_document.getClass().getSimpleName())
-        wdtk_resource = wdtk_rdf_writer.getUri(wdtk_document.getEntityId().getIri())
-
-        if wdtk_document_class not in (
-            "ItemDocumentImpl",
-            "PropertyDocumentImpl",
-            "EntityRedirectDocumentImpl",
-        ):
-            raise WikidataRdfConversionError(
-                f"RDF serialization of {wdtk_document_class} not implemented.", revision
-            )
+        # Which kind of document we are dealing with is already known from how it was
+        # deserialized, so we do not need to ask the JVM for the document's class.
+        wdtk_document, is_redirect = self._load_wdtk_document(revision)
 
         try:
-            if wdtk_document_class == "ItemDocumentImpl":
-                wdtk_rdf_converter.writeDocumentType(
-                    wdtk_resource, wdtk_rdf_writer.WB_ITEM
-                )
-                wdtk_rdf_converter.writeDocumentTerms(wdtk_document)
-                wdtk_rdf_converter.writeStatements(wdtk_document)
-                wdtk_rdf_converter.writeSiteLinks(
-                    wdtk_resource, wdtk_document.getSiteLinks()
-                )
+            wdtk_entity_iri = wdtk_document.getEntityId().getIri()
 
-            elif wdtk_document_class == "PropertyDocumentImpl":
-                wdtk_rdf_converter.writeDocumentType(
-                    wdtk_resource, wdtk_rdf_writer.WB_PROPERTY
-                )
-                wdtk_rdf_converter.writePropertyDatatype(wdtk_document)
-                wdtk_rdf_converter.writeDocumentTerms(wdtk_document)
-                wdtk_rdf_converter.writeStatements(wdtk_document)
-                wdtk_rdf_converter.writeInterPropertyLinks(wdtk_document)
-
-            elif wdtk_document_class == "EntityRedirectDocumentImpl":
+            if is_redirect:
                 # TODO: document that revisions that contain the "redirect" field in
                 #  their JSON indicate that the respective entity is being redirected to
                 #  the target entity starting from that point in time. Additionally, if
@@ -229,11 +293,30 @@ class WikidataRdfConverter:
                 # all. We choose to use owl:sameAs here on the basis that the Wikidata
                 # Query Service also uses it to represent redirects.
                 wdtk_rdf_writer.writeTripleUriObject(
-                    wdtk_document.getEntityId().getIri(),
+                    wdtk_entity_iri,
                     wdtk_rdf_writer.getUri("http://www.w3.org/2002/07/owl#sameAs"),
                     wdtk_document.getTargetId().getIri(),
                 )
 
+            elif revision.wikibase_model == "wikibase-item":
+                wdtk_resource = wdtk_rdf_writer.getUri(wdtk_entity_iri)
+                wdtk_rdf_converter.writeDocumentType(wdtk_resource, self._wdtk_wb_item)
+                wdtk_rdf_converter.writeDocumentTerms(wdtk_document)
+                wdtk_rdf_converter.writeStatements(wdtk_document)
+                wdtk_rdf_converter.writeSiteLinks(
+                    wdtk_resource, wdtk_document.getSiteLinks()
+                )
+
+            elif revision.wikibase_model == "wikibase-property":
+                wdtk_resource = wdtk_rdf_writer.getUri(wdtk_entity_iri)
+                wdtk_rdf_converter.writeDocumentType(
+                    wdtk_resource, self._wdtk_wb_property
+                )
+                wdtk_rdf_converter.writePropertyDatatype(wdtk_document)
+                wdtk_rdf_converter.writeDocumentTerms(wdtk_document)
+                wdtk_rdf_converter.writeStatements(wdtk_document)
+                wdtk_rdf_converter.writeInterPropertyLinks(wdtk_document)
+
         except JException as e:
             raise WikidataRdfConversionError(
                 "RDF serialization by Wikidata Toolkit failed.", revision, e
@@ -251,7 +334,16 @@ class WikidataRdfConverter:
 
         wdtk_rdf_writer.finish()
 
-        return WikidataRdfRevision(
+        # Converting the ByteArrayOutputStream via str() would decode it into a Java
+        # String first, which JPype then has to convert into a Python string. Copying
+        # the raw bytes and decoding them in Python is an order of magnitude faster.
+        ntriples = bytes(self._wdtk_output_stream.toByteArray()).decode("UTF-8")
+
+        # All metadata fields are copied from the already validated raw revision and the
+        # triples are created by us, so skip Pydantic's validation, which would
+        # otherwise check and rebuild every single one of the possibly thousands of
+        # triples.
+        return WikidataRdfRevision.construct(
             entity_id=revision.entity_id,
             page_id=revision.page_id,
             namespace=revision.namespace,
@@ -266,33 +358,29 @@ class WikidataRdfConverter:
             wikibase_model=revision.wikibase_model,
             wikibase_format=revision.wikibase_format,
             sha1=revision.sha1,
-            triples=self._parse_ntriples(str(wdtk_output_stream)),
+            triples=self._parse_ntriples(ntriples),
         )
 
-    def _load_wdtk_document(self, revision: WikidataRawRevision) -> JObject:
+    def _load_wdtk_document(
+        self, revision: WikidataRawRevision
+    ) -> Tuple[JObject, bool]:
         if revision.text is None:
             raise WikidataRdfConversionError("Entity has not text.", revision)
 
         # The following is based on WDTK's WikibaseRevisionProcessor.
         try:
-            if '"redirect":' in revision.text:
-                return self._wdtk_json_deserializer.deserializeEntityRedirectDocument(
-                    revision.text
-                )
-            elif revision.wikibase_model == "wikibase-item":
-                return self._wdtk_json_deserializer.deserializeItemDocument(
-                    revision.text
-                )
-            elif revision.wikibase_model == "wikibase-property":
-                return self._wdtk_json_deserializer.deserializePropertyDocument(
-                    revision.text
-                )
-            else:
+            if revision.text.find('"redirect":', 0, _REDIRECT_KEY_SEARCH_LENGTH) != -1:
+                return self._wdtk_deserialize_redirect(revision.text), True
+            deserialize = self._wdtk_deserialize_by_wikibase_model.get(
+                revision.wikibase_model
+            )
+            if deserialize is None:
                 raise WikidataRdfConversionError(
                     f"JSON deserialization of {revision.wikibase_model} not "
                     "implemented by Wikidata Toolkit.",
                     revision,
                 )
+            return deserialize(revision.text), False
         except JException as e:
             raise WikidataRdfConversionError(
                 "JSON deserialization by Wikidata Toolkit failed.", revision, e
@@ -319,11 +407,18 @@ class WikidataRdfConverter:
     def _prefix_ntriples_iri(cls, iri: str) -> str:
         if iri[0] != "<":  # If IRI starts with a "<" it also ends with a ">".
             return iri  # Argument is not an IRI.
+        return cls._prefix_ntriples_iri_cached(iri)
 
-        # iri[1:-1] is the uri without the angle brackets.
-        prefix_iris = _WIKIDATA_RDF_PREFIXES_TRIE.prefixes(iri[1:-1])
-        if prefix_iris:
-            prefix_iri = prefix_iris[-1]  # Longest prefix is always at the end.
-            prefix = WIKIDATA_RDF_PREFIXES[prefix_iri]
-            return f"{prefix}:{iri[len(prefix_iri) + 1 : -1]}"  # [+1:-1] like before.
+    # The same IRIs recur constantly: within a revision (the entity IRI, predicates)
+    # and even more so across consecutive revisions of an entity, which mostly consist
+    # of the same triples. Memoizing the abbreviation means most IRIs are handled with
+    # a single C-level cache lookup. Literals never enter the cache, as they rarely
+    # recur and can be arbitrarily long.
+    @classmethod
+    @lru_cache(maxsize=2 ** 16)
+    def _prefix_ntriples_iri_cached(cls, iri: str) -> str:
+        match = _WIKIDATA_RDF_PREFIXES_PATTERN.match(iri)
+        if match:
+            # [match.end():-1] is the remainder of the IRI without the closing ">".
+            return f"{match.lastgroup}:{iri[match.end() : -1]}"
         return iri
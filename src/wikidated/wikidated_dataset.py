@@ -124,6 +124,8 @@ class WikidatedGenericDataset(
         wikidata_dump: WikidataDump,
         *,
         max_workers: Optional[int] = 4,
+        conversion_threads: int = 1,
+        validate_revisions: bool = True,
     ) -> WikidatedDataset:
         _LOGGER.info(f"Building dataset {dataset_dir.name} with {max_workers} workers.")
         entity_streams = WikidatedEntityStreams.build_custom(
@@ -132,6 +134,8 @@ class WikidatedGenericDataset(
             wikidata_dump.sites_table,
             wikidata_dump.pages_meta_history,
             max_workers=max_workers,
+            conversion_threads=conversion_threads,
+            validate_revisions=validate_revisions,
         )
         sorted_entity_streams = WikidatedSortedEntityStreams.build_custom(
             dataset_dir, entity_streams
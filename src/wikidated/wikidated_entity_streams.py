@@ -17,20 +17,29 @@
 from __future__ import annotations
 
 import re
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, wait
 from datetime import datetime, timezone
-from itertools import chain, groupby
+from itertools import groupby
 from logging import getLogger
 from pathlib import Path
+from queue import SimpleQueue
 from shutil import rmtree
 from sys import maxsize
 from typing import (
+    IO,
+    AbstractSet,
     Any,
+    Callable,
+    ClassVar,
+    Deque,
     Generic,
     Iterable,
     Iterator,
     Mapping,
-    MutableSet,
+    MutableSequence,
     Optional,
+    Sequence,
     Tuple,
     TypeVar,
     Union,
@@ -44,6 +53,7 @@ from wikidated._utils import (
     ParallelizeUpdateProgressFunc,
     RangeMap,
     SevenZipArchive,
+    iter_in_background_thread,
     parallelize,
 )
 from wikidated.wikidata import (
@@ -52,17 +62,69 @@ from wikidated.wikidata import (
     WikidataRawRevision,
     WikidataRdfConversionError,
     WikidataRdfConverter,
+    WikidataRdfRevision,
     WikidataRdfTriple,
 )
 from wikidated.wikidated_revision import WikidatedRevision
 
 _LOGGER = getLogger(__name__)
 
+# Compiled once, as it is matched against every file name in an entity streams
+# archive, which can be hundreds of thousands of files.
+_ARCHIVE_COMPONENT_PATH_PATTERN = re.compile(r"p(?P<page_id>\d+).jsonl")
+
+# How many revisions may be waiting for or in RDF conversion per conversion thread.
+# Revisions have to be yielded in order, so this bounds how many converted revisions
+# pile up behind a single slow one.
+_MAX_PENDING_REVISIONS_PER_THREAD = 4
+
+# How many raw revisions may be parsed ahead of RDF conversion (see _build_archive).
+_MAX_PREFETCHED_REVISIONS = 64
+
+_TripleKey = Tuple[str, str, str]
+
+
+def _diff_triples(
+    state: Mapping[_TripleKey, WikidataRdfTriple], triples: Sequence[WikidataRdfTriple]
+) -> Tuple[
+    Sequence[WikidataRdfTriple],
+    Sequence[WikidataRdfTriple],
+    Mapping[_TripleKey, WikidataRdfTriple],
+]:
+    # Computes the sorted triple deletions and additions from the previous revision,
+    # whose triples are given by state, to the current one. Also returns the state for
+    # diffing the next revision. Kept free of any Pydantic models, the kernel only
+    # works on (named) tuples of strings, lists, and dicts.
+    #
+    # Instead of putting the triples themselves into sets, we key them by plain tuples
+    # in which blank nodes in object position are replaced by "_:". These keys are
+    # equal exactly if the triples are equal (see WikidataRdfTriple), but hashing and
+    # comparing them does not call back into Python code, which makes the lookups below
+    # about twice as fast. Iterating in reverse keeps the first of several triples with
+    # the same key, like building a set would.
+    triples_by_key = {
+        (subject, predicate, "_:" if object_[:1] == "_" else object_): triple
+        for triple in reversed(triples)
+        for subject, predicate, object_ in (triple,)
+    }
+    triple_deletions = sorted(
+        triple for key, triple in state.items() if key not in triples_by_key
+    )
+    triple_additions = sorted(
+        triple for key, triple in triples_by_key.items() if key not in state
+    )
+    return triple_deletions, triple_additions, triples_by_key
+
 
 class WikidatedEntityStreamsFile:
     def __init__(self, archive_path: Path, page_ids: range) -> None:
         self.archive_path: Final = archive_path
         self.page_ids: Final = page_ids
+        # The page IDs of the entities actually contained in the archive. Listing them
+        # requires a full scan of the archive's file names, so they are only computed
+        # once, the first time they are needed.
+        self._contained_page_ids: Optional[Sequence[int]] = None
+        self._contained_page_ids_set: AbstractSet[int] = frozenset()
 
     def iter_revisions(
         self,
@@ -75,6 +137,13 @@ class WikidatedEntityStreamsFile:
     ) -> Iterator[WikidatedRevision]:
         if not self.archive_path.exists():
             raise FileNotFoundError(self.archive_path)
+        if (
+            page_id is not None
+            and self._contained_page_ids is not None
+            and page_id not in self._contained_page_ids_set
+        ):
+            # Avoid starting 7z just to find out that the page is not in the archive.
+            return
         archive = SevenZipArchive(self.archive_path)
         min_revision_id_ = min_revision_id or -maxsize
         max_revision_id_ = max_revision_id or maxsize
@@ -84,11 +153,11 @@ class WikidatedEntityStreamsFile:
             min_timestamp_ = min_timestamp_.replace(tzinfo=timezone.utc)
         if not max_timestamp_.tzinfo:
             max_timestamp_ = max_timestamp_.replace(tzinfo=timezone.utc)
-        with archive.read(
+        with archive.read_bytes(
             self._make_archive_component_path(page_id) if page_id else None
         ) as fd:
             for line in fd:
-                revision = WikidatedRevision.parse_raw(line)
+                revision = WikidatedRevision.from_json_bytes(line)
                 if (
                     revision.revision_id < min_revision_id_
                     or revision.timestamp < min_timestamp_
@@ -107,11 +176,16 @@ class WikidatedEntityStreamsFile:
                 yield revision
 
     def iter_page_ids(self) -> Iterator[int]:
-        if not self.archive_path.exists():
-            raise FileNotFoundError(self.archive_path)
-        archive = SevenZipArchive(self.archive_path)
-        for path in archive.iter_file_names():
-            yield WikidatedEntityStreamsFile._parse_archive_component_path(path)
+        if self._contained_page_ids is None:
+            if not self.archive_path.exists():
+                raise FileNotFoundError(self.archive_path)
+            archive = SevenZipArchive(self.archive_path)
+            self._contained_page_ids = [
+                WikidatedEntityStreamsFile._parse_archive_component_path(path)
+                for path in archive.iter_file_names()
+            ]
+            self._contained_page_ids_set = frozenset(self._contained_page_ids)
+        yield from self._contained_page_ids
 
     @classmethod
     def archive_path_glob(cls, dataset_dir: Path) -> str:
@@ -144,7 +218,7 @@ class WikidatedEntityStreamsFile:
 
     @classmethod
     def _parse_archive_component_path(cls, path: Path) -> int:
-        match = re.match(r"p(?P<page_id>\d+).jsonl", path.name)
+        match = _ARCHIVE_COMPONENT_PATH_PATTERN.match(path.name)
         assert match
 
         page_id = int(match["page_id"])
@@ -160,8 +234,22 @@ class WikidatedEntityStreamsFile:
         cls,
         dataset_dir: Path,
         pages_meta_history: WikidataDumpPagesMetaHistory,
-        rdf_converter: WikidataRdfConverter,
+        rdf_converters: Sequence[WikidataRdfConverter],
+        conversion_executor: Optional[Executor] = None,
+        archive_executor: Optional[Executor] = None,
+        archive_futures: Optional[MutableSequence[Future[None]]] = None,
+        validate_revisions: bool = True,
     ) -> Tuple[WikidatedEntityStreamsFile, Iterator[WikidatedRevision]]:
+        # With multiple rdf_converters, conversions are run on conversion_executor,
+        # which needs at least as many threads as there are converters. If it is not
+        # given, a thread pool is started just for building this file.
+        # If an archive_executor is given, the final compression of the archive is
+        # submitted to it, i.e., the archive might not exist yet once the returned
+        # iterator is exhausted. The caller has to wait for the executor then, and
+        # should check for errors via the future that is appended to archive_futures.
+        # Before submitting, the futures already in archive_futures are waited for.
+        # Setting validate_revisions to False skips pydantic's validation of the built
+        # revisions, which are constructed from already parsed data anyways.
         archive_path = cls._make_archive_path(dataset_dir, pages_meta_history.page_ids)
         revisions_iter: Iterator[WikidatedRevision] = iter([])
         if archive_path.exists():
@@ -171,7 +259,13 @@ class WikidatedEntityStreamsFile:
             )
         else:
             revisions_iter = cls._build_archive(
-                archive_path, pages_meta_history, rdf_converter
+                archive_path,
+                pages_meta_history,
+                rdf_converters,
+                conversion_executor,
+                archive_executor,
+                archive_futures,
+                validate_revisions,
             )
         return (
             WikidatedEntityStreamsFile(archive_path, pages_meta_history.page_ids),
@@ -183,7 +277,11 @@ class WikidatedEntityStreamsFile:
         cls,
         archive_path: Path,
         pages_meta_history: WikidataDumpPagesMetaHistory,
-        rdf_converter: WikidataRdfConverter,
+        rdf_converters: Sequence[WikidataRdfConverter],
+        conversion_executor: Optional[Executor],
+        archive_executor: Optional[Executor],
+        archive_futures: Optional[MutableSequence[Future[None]]],
+        validate_revisions: bool,
     ) -> Iterator[WikidatedRevision]:
         _LOGGER.debug(f"Building entity streams file {archive_path.name}.")
 
@@ -195,70 +293,187 @@ class WikidatedEntityStreamsFile:
             rmtree(tmp_dir)
         tmp_dir.mkdir(exist_ok=True, parents=True)
 
-        for page_id, revisions in groupby(
-            pages_meta_history.iter_revisions(display_progress_bar=False),
-            lambda revision: revision.page_id,
-        ):
-            wikidated_revisions = cls._iter_wikidated_revisions(
-                revisions, rdf_converter
-            )
-
-            # In the following we check if we can access the first element in the
-            # iterable. If it does not exist, the current page does not describe a
-            # Wikidata entity (e.g., it could be a wikitext page). Only if it exists, we
-            # add a file to the output archive.
+        revisions = pages_meta_history.iter_revisions(display_progress_bar=False)
+        if len(rdf_converters) > 1:
+            # With multiple conversion threads, parse the dump in yet another thread, so
+            # that reading from the 7z pipe and parsing the XML overlap with diffing and
+            # writing the previous revisions instead of keeping the converters waiting.
+            revisions = iter_in_background_thread(revisions, _MAX_PREFETCHED_REVISIONS)
 
+        for page_id, rdf_revisions in groupby(
+            cls._iter_rdf_revisions(revisions, rdf_converters, conversion_executor),
+            lambda revision_and_rdf_revision: revision_and_rdf_revision[0].page_id,
+        ):
+            # If no Wikidated revisions can be constructed for a page, it does not
+            # describe a Wikidata entity (e.g., it could be a wikitext page). Hence, we
+            # only add a file to the output archive once the first revision exists.
+            tmp_file = tmp_dir / cls._make_archive_component_path(page_id)
+            fd: Optional[IO[bytes]] = None
             try:
-                first_wikidated_revision = next(wikidated_revisions)
-            except StopIteration:
+                for wikidated_revision in cls._iter_wikidated_revisions(
+                    rdf_revisions, validate_revisions
+                ):
+                    if fd is None:
+                        fd = tmp_file.open("wb")
+                    fd.write(wikidated_revision.to_json_bytes() + b"\n")
+                    yield wikidated_revision
+            finally:
+                if fd is not None:
+                    fd.close()
+
+            if fd is None:
                 _LOGGER.debug(
                     f"Could not construct any Wikidated revisions for page {page_id}. "
                     "Most likely this page does not describe a Wikidata entity."
                 )
-                continue
 
-            with (tmp_dir / cls._make_archive_component_path(page_id)).open(
-                "w", encoding="UTF-8"
-            ) as fd:
-                for wikidated_revision in chain(
-                    (first_wikidated_revision,), wikidated_revisions
-                ):
-                    fd.write(wikidated_revision.json() + "\n")
-                    yield wikidated_revision
+        if archive_executor is None:
+            cls._compress_archive(tmp_dir, archive_path)
+        else:
+            cls._submit_compress_archive(
+                tmp_dir, archive_path, archive_executor, archive_futures
+            )
 
-        SevenZipArchive.from_dir_with_order(
-            tmp_dir,
-            archive_path,
-            key=lambda path: cls._parse_archive_component_path(path),
+    @classmethod
+    def _submit_compress_archive(
+        cls,
+        tmp_dir: Path,
+        archive_path: Path,
+        archive_executor: Executor,
+        archive_futures: Optional[MutableSequence[Future[None]]],
+    ) -> None:
+        if archive_futures:
+            # Only ever keep one compression pending, i.e., compressing the previous
+            # archive overlaps with converting this one, but no uncompressed temporary
+            # directories pile up if 7z is the slower one.
+            wait(archive_futures)
+        archive_future = archive_executor.submit(
+            cls._compress_archive, tmp_dir, archive_path
         )
-        rmtree(tmp_dir)
+        if archive_futures is not None:
+            archive_futures.append(archive_future)
+
+    @classmethod
+    def _compress_archive(cls, tmp_dir: Path, archive_path: Path) -> None:
+        try:
+            SevenZipArchive.from_dir_with_order(
+                tmp_dir,
+                archive_path,
+                key=cls._parse_archive_component_path,
+            )
+            rmtree(tmp_dir)
+        except Exception:
+            # Log here already, as the exception is only raised from the archive's
+            # future once someone checks it, which might be much later.
+            _LOGGER.exception(
+                f"Could not create entity streams file {archive_path.name}."
+            )
+            raise
 
         _LOGGER.debug(f"Done building entity streams file {archive_path.name}.")
 
     @classmethod
-    def _iter_wikidated_revisions(
+    def _iter_rdf_revisions(
         cls,
         revisions: Iterator[WikidataRawRevision],
-        rdf_converter: WikidataRdfConverter,
-    ) -> Iterator[WikidatedRevision]:
-        state: MutableSet[WikidataRdfTriple] = set()
+        rdf_converters: Sequence[WikidataRdfConverter],
+        conversion_executor: Optional[Executor],
+    ) -> Iterator[Tuple[WikidataRawRevision, Optional[WikidataRdfRevision]]]:
+        if len(rdf_converters) == 1:
+            for revision in revisions:
+                yield revision, cls._convert_revision(revision, rdf_converters[0])
+        elif conversion_executor is None:
+            with ThreadPoolExecutor(max_workers=len(rdf_converters)) as pool:
+                yield from cls._iter_rdf_revisions_in_executor(
+                    revisions, rdf_converters, pool
+                )
+        else:
+            yield from cls._iter_rdf_revisions_in_executor(
+                revisions, rdf_converters, conversion_executor
+            )
 
-        for revision in revisions:
+    @classmethod
+    def _iter_rdf_revisions_in_executor(
+        cls,
+        revisions: Iterator[WikidataRawRevision],
+        rdf_converters: Sequence[WikidataRdfConverter],
+        conversion_executor: Executor,
+    ) -> Iterator[Tuple[WikidataRawRevision, Optional[WikidataRdfRevision]]]:
+        # Most of the RDF conversion happens inside the JVM, during which JPype
+        # releases the GIL, so that multiple conversion threads can actually run in
+        # parallel. A WikidataRdfConverter is not thread-safe, so each conversion
+        # borrows one of the converters for its duration. Results are yielded in the
+        # order of the input revisions.
+        idle_rdf_converters: SimpleQueue[WikidataRdfConverter] = SimpleQueue()
+        for rdf_converter in rdf_converters:
+            idle_rdf_converters.put(rdf_converter)
+
+        def convert_revision(
+            revision: WikidataRawRevision,
+        ) -> Optional[WikidataRdfRevision]:
+            rdf_converter = idle_rdf_converters.get()
             try:
-                rdf_revision = rdf_converter(revision)
-            except WikidataRdfConversionError:
-                _LOGGER.debug(
-                    f"RDF conversion error for revision {revision.revision_id}.",
-                    exc_info=True,
+                return cls._convert_revision(revision, rdf_converter)
+            finally:
+                idle_rdf_converters.put(rdf_converter)
+
+        max_pending_revisions = _MAX_PENDING_REVISIONS_PER_THREAD * len(rdf_converters)
+        pending_revisions: Deque[
+            Tuple[WikidataRawRevision, Future[Optional[WikidataRdfRevision]]]
+        ] = deque()
+        try:
+            for revision in revisions:
+                pending_revisions.append(
+                    (revision, conversion_executor.submit(convert_revision, revision))
                 )
+                if len(pending_revisions) >= max_pending_revisions:
+                    pending_revision, rdf_revision_future = pending_revisions.popleft()
+                    yield pending_revision, rdf_revision_future.result()
+            while pending_revisions:
+                pending_revision, rdf_revision_future = pending_revisions.popleft()
+                yield pending_revision, rdf_revision_future.result()
+        finally:
+            # If iteration stops early, the executor lives on. Make sure none of our
+            # conversions still use a converter once the next file is being built.
+            for _, rdf_revision_future in pending_revisions:
+                rdf_revision_future.cancel()
+            wait([rdf_revision_future for _, rdf_revision_future in pending_revisions])
+
+    @classmethod
+    def _convert_revision(
+        cls, revision: WikidataRawRevision, rdf_converter: WikidataRdfConverter
+    ) -> Optional[WikidataRdfRevision]:
+        try:
+            return rdf_converter(revision)
+        except WikidataRdfConversionError:
+            _LOGGER.debug(
+                f"RDF conversion error for revision {revision.revision_id}.",
+                exc_info=True,
+            )
+            return None
+
+    @classmethod
+    def _iter_wikidated_revisions(
+        cls,
+        rdf_revisions: Iterator[
+            Tuple[WikidataRawRevision, Optional[WikidataRdfRevision]]
+        ],
+        validate_revisions: bool,
+    ) -> Iterator[WikidatedRevision]:
+        make_revision: Callable[..., WikidatedRevision] = (
+            WikidatedRevision if validate_revisions else WikidatedRevision.construct
+        )
+        state: Mapping[_TripleKey, WikidataRdfTriple] = {}
+
+        for revision, rdf_revision in rdf_revisions:
+            if rdf_revision is None:
                 continue
 
-            triples_set = set(rdf_revision.triples)
-            triple_deletions = sorted(state - triples_set)
-            triple_additions = sorted(triples_set - state)
-            state = triples_set
+            triple_deletions, triple_additions, state = _diff_triples(
+                state, rdf_revision.triples
+            )
 
-            yield WikidatedRevision(
+            yield make_revision(
                 entity_id=revision.entity_id,
                 page_id=revision.page_id,
                 namespace=revision.namespace,
@@ -281,7 +496,7 @@ class WikidatedEntityStreamsFile:
 # Variables used to communicate with child processes:
 _JARS_DIR: Optional[Path] = None
 _SITES_TABLE: Optional[WikidataDumpSitesTable] = None
-_JVM_MANAGER: Optional[JvmManager] = None
+_CONVERSION_THREADS: int = 1
 
 
 _T_WikidatedEntityStreamsFile_co = TypeVar(
@@ -292,6 +507,19 @@ _T_WikidatedEntityStreamsFile_co = TypeVar(
 
 
 class WikidatedGenericEntityStreams(Generic[_T_WikidatedEntityStreamsFile_co]):
+    # State owned by a worker process while building entity streams. It is created by
+    # the worker itself and therefore never needs to be passed to child processes.
+    _jvm_manager: ClassVar[Optional[JvmManager]] = None
+    # Runs the RDF conversions if there are multiple conversion threads. Kept for all
+    # parts a worker builds, so that its threads attach to the JVM only once.
+    _conversion_executor: ClassVar[Optional[ThreadPoolExecutor]] = None
+    # Compresses a finished part's entity streams archive with 7z, while the worker
+    # already continues with converting the next part.
+    _archive_executor: ClassVar[Optional[ThreadPoolExecutor]] = None
+    # Futures of the archives submitted to _archive_executor that were not yet checked
+    # for errors. As the executor has a single thread, they complete in order.
+    _archive_futures: ClassVar[Deque[Future[None]]] = deque()
+
     def __init__(
         self, files_by_page_ids: RangeMap[_T_WikidatedEntityStreamsFile_co]
     ) -> None:
@@ -343,23 +571,42 @@ class WikidatedGenericEntityStreams(Generic[_T_WikidatedEntityStreamsFile_co]):
         sites_table: WikidataDumpSitesTable,
         pages_meta_history: RangeMap[WikidataDumpPagesMetaHistory],
         max_workers: Optional[int] = 4,
+        conversion_threads: int = 1,
+        validate_revisions: bool = True,
     ) -> WikidatedEntityStreams:
         _LOGGER.debug(f"Building entity streams for dataset {dataset_dir.name}.")
-        global _JARS_DIR, _SITES_TABLE
+        if conversion_threads < 1:
+            raise ValueError("conversion_threads needs to be at least 1.")
+        global _JARS_DIR, _SITES_TABLE, _CONVERSION_THREADS
         _JARS_DIR = jars_dir
         _SITES_TABLE = sites_table
+        _CONVERSION_THREADS = conversion_threads
         files_by_page_ids = RangeMap[WikidatedEntityStreamsFile]()
+        # Wikidata already splits its pages-meta-history dump into hundreds of
+        # independently compressed 7z files. We parallelize over these instead of
+        # trying to parallelize decompression within a single file, so that each
+        # worker process runs its own 7z decompressor next to its own parser. Each of
+        # these parts takes minutes to convert, so they are not chunked: the overhead of
+        # sending one to a worker is negligible and chunking would hurt load balancing.
         for file in parallelize(
             cls._build_part,
             pages_meta_history.values(),
             num_arguments=len(pages_meta_history),
-            extra_arguments={"dataset_dir": dataset_dir},
+            extra_arguments={
+                "dataset_dir": dataset_dir,
+                "validate_revisions": validate_revisions,
+            },
             init_worker_func=cls._init_worker_with_rdf_converter,
             exit_worker_func=cls._exit_worker_with_rdf_converter,
             max_workers=max_workers,
             progress_bar_desc="Entity Streams",
         ):
             files_by_page_ids[file.page_ids] = file
+        # Archives are compressed in the background of the workers (see _build_part), so
+        # make sure that none of them failed without anyone noticing.
+        for file in files_by_page_ids.values():
+            if not file.archive_path.exists():
+                raise FileNotFoundError(file.archive_path)
         _LOGGER.debug(f"Done building entity streams for dataset {dataset_dir.name}.")
         return WikidatedEntityStreams(files_by_page_ids)
 
@@ -372,11 +619,24 @@ class WikidatedGenericEntityStreams(Generic[_T_WikidatedEntityStreamsFile_co]):
     ) -> WikidatedEntityStreamsFile:
         dataset_dir = extra_arguments["dataset_dir"]
         assert isinstance(dataset_dir, Path)
-        rdf_converter = extra_arguments["rdf_converter"]
-        assert isinstance(rdf_converter, WikidataRdfConverter)
+        validate_revisions = extra_arguments["validate_revisions"]
+        assert isinstance(validate_revisions, bool)
+        rdf_converters = extra_arguments["rdf_converters"]
+        assert isinstance(rdf_converters, list)
+        assert WikidatedGenericEntityStreams._jvm_manager is not None
+        archive_executor = WikidatedGenericEntityStreams._archive_executor
+        assert archive_executor is not None
+        # Raise errors from compressing previous parts' archives as early as possible.
+        cls._check_archive_futures(block=False)
 
         file, revisions_builder = WikidatedEntityStreamsFile.build_custom(
-            dataset_dir, argument, rdf_converter
+            dataset_dir,
+            argument,
+            rdf_converters,
+            conversion_executor=WikidatedGenericEntityStreams._conversion_executor,
+            archive_executor=archive_executor,
+            archive_futures=WikidatedGenericEntityStreams._archive_futures,
+            validate_revisions=validate_revisions,
         )
         progress_name = file.archive_path.name
         progress_current = 0
@@ -389,20 +649,63 @@ class WikidatedGenericEntityStreams(Generic[_T_WikidatedEntityStreamsFile_co]):
         update_progress(progress_name, progress_total, progress_total)
         return file
 
+    @classmethod
+    def _check_archive_futures(cls, *, block: bool) -> None:
+        archive_futures = WikidatedGenericEntityStreams._archive_futures
+        while archive_futures and (block or archive_futures[0].done()):
+            archive_futures.popleft().result()
+
     @classmethod
     def _init_worker_with_rdf_converter(cls) -> Mapping[str, object]:
         assert _JARS_DIR is not None
         assert _SITES_TABLE is not None
-        global _JVM_MANAGER
-        _JVM_MANAGER = JvmManager(jars_dir=_JARS_DIR)
-        return {"rdf_converter": WikidataRdfConverter(_SITES_TABLE, _JVM_MANAGER)}
+        # This is called once per worker process, not once per part. Starting the JVM
+        # takes seconds and JPype can not restart it within the same process, so each
+        # worker keeps its JVM (and the loaded sites table) for all parts it builds.
+        # Always access the class variables via WikidatedGenericEntityStreams itself, so
+        # that assigning them can never shadow them on a subclass.
+        if WikidatedGenericEntityStreams._jvm_manager is None:
+            WikidatedGenericEntityStreams._jvm_manager = JvmManager(jars_dir=_JARS_DIR)
+        jvm_manager = WikidatedGenericEntityStreams._jvm_manager
+        if (
+            _CONVERSION_THREADS > 1
+            and WikidatedGenericEntityStreams._conversion_executor is None
+        ):
+            WikidatedGenericEntityStreams._conversion_executor = ThreadPoolExecutor(
+                max_workers=_CONVERSION_THREADS
+            )
+        if WikidatedGenericEntityStreams._archive_executor is None:
+            WikidatedGenericEntityStreams._archive_executor = ThreadPoolExecutor(
+                max_workers=1
+            )
+        return {
+            "rdf_converters": [
+                WikidataRdfConverter(_SITES_TABLE, jvm_manager)
+                for _ in range(_CONVERSION_THREADS)
+            ]
+        }
 
     @classmethod
     def _exit_worker_with_rdf_converter(cls) -> None:
-        global _JVM_MANAGER
-        if _JVM_MANAGER is not None:
-            _JVM_MANAGER.close()
-            _JVM_MANAGER = None
+        conversion_executor = WikidatedGenericEntityStreams._conversion_executor
+        if conversion_executor is not None:
+            conversion_executor.shutdown(wait=True)
+            WikidatedGenericEntityStreams._conversion_executor = None
+        archive_executor = WikidatedGenericEntityStreams._archive_executor
+        if archive_executor is not None:
+            # Only let the worker exit once all of its archives have been written.
+            archive_executor.shutdown(wait=True)
+            WikidatedGenericEntityStreams._archive_executor = None
+        try:
+            # Exceptions raised here are only printed by multiprocessing, the missing
+            # archives are detected by build_custom() then.
+            cls._check_archive_futures(block=True)
+        finally:
+            WikidatedGenericEntityStreams._archive_futures.clear()
+            jvm_manager = WikidatedGenericEntityStreams._jvm_manager
+            if jvm_manager is not None:
+                jvm_manager.close()
+                WikidatedGenericEntityStreams._jvm_manager = None
 
 
 WikidatedEntityStreams = WikidatedGenericEntityStreams[WikidatedEntityStreamsFile]
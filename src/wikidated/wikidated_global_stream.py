@@ -21,6 +21,7 @@ import re
 from datetime import date, datetime, timedelta, timezone
 from itertools import chain, takewhile
 from logging import getLogger
+from operator import attrgetter
 from pathlib import Path
 from shutil import rmtree
 from sys import maxsize
@@ -82,9 +83,9 @@ class WikidatedGlobalStreamFile:
             min_timestamp_ = min_timestamp_.replace(tzinfo=timezone.utc)
         if not max_timestamp_.tzinfo:
             max_timestamp_ = max_timestamp_.replace(tzinfo=timezone.utc)
-        with archive.read() as fd:
+        with archive.read_bytes() as fd:
             for line in fd:
-                revision = WikidatedRevision.parse_raw(line)
+                revision = WikidatedRevision.from_json_bytes(line)
                 if (
                     revision.revision_id < min_revision_id_
                     or revision.timestamp < min_timestamp_
@@ -225,7 +226,7 @@ class WikidatedGlobalStreamFile:
     ) -> Tuple[Optional[range], Iterator[WikidatedRevision]]:
         tmp_file = tmp_dir / f"tmp.{day:%4Y%2m%2d}.jsonl"
         revision_ids_of_day: Optional[range] = None
-        with tmp_file.open("w", encoding="UTF-8") as fd:
+        with tmp_file.open("wb") as fd:
             for revision in revisions:
                 revision_date = revision.timestamp.date()
                 if revision_date < day:
@@ -250,7 +251,7 @@ class WikidatedGlobalStreamFile:
                     else revision_ids_of_day.start,
                     revision.revision_id + 1,
                 )
-                fd.write(revision.json() + "\n")
+                fd.write(revision.to_json_bytes() + b"\n")
 
         if revision_ids_of_day is None:
             # No revisions for this day existed.
@@ -383,7 +384,7 @@ class WikidatedGenericGlobalStream(Generic[_T_WikidatedGlobalStreamFile_co]):
             for sorted_entity_streams_file in sorted_entity_streams
         ]
         sorted_revisions = iter(
-            heapq.merge(*sorted_entity_streams_iters, key=lambda rev: rev.revision_id)
+            heapq.merge(*sorted_entity_streams_iters, key=attrgetter("revision_id"))
         )
 
         files_by_months = RangeMap[WikidatedGlobalStreamFile]()
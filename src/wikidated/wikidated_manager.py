@@ -59,13 +59,19 @@ class WikidatedManager:
         return WikidatedDataset.load_custom(dataset_dir)
 
     def build_custom(
-        self, wikidata_dump: WikidataDump, max_workers: Optional[int] = 4
+        self,
+        wikidata_dump: WikidataDump,
+        max_workers: Optional[int] = 4,
+        conversion_threads: int = 1,
+        validate_revisions: bool = True,
     ) -> WikidatedDataset:
         return WikidatedDataset.build_custom(
             self.data_dir / f"wikidated-custom-{wikidata_dump.version:%4Y%2m%2d}",
             self.jars_dir,
             wikidata_dump,
             max_workers=max_workers,
+            conversion_threads=conversion_threads,
+            validate_revisions=validate_revisions,
         )
 
     def v1_0(self, auto_download: bool = True) -> WikidatedV1_0Dataset:
@@ -19,6 +19,7 @@ from __future__ import annotations
 import re
 from datetime import datetime, timezone
 from logging import getLogger
+from operator import attrgetter
 from pathlib import Path
 from sys import maxsize
 from typing import (
@@ -70,9 +71,9 @@ class WikidatedSortedEntityStreamsFile:
             min_timestamp_ = min_timestamp_.replace(tzinfo=timezone.utc)
         if not max_timestamp_.tzinfo:
             max_timestamp_ = max_timestamp_.replace(tzinfo=timezone.utc)
-        with archive.read() as fd:
+        with archive.read_bytes() as fd:
             for line in fd:
-                revision = WikidatedRevision.parse_raw(line)
+                revision = WikidatedRevision.from_json_bytes(line)
                 if (
                     revision.revision_id < min_revision_id_
                     or revision.timestamp < min_timestamp_
@@ -129,10 +130,10 @@ class WikidatedSortedEntityStreamsFile:
             _LOGGER.debug(f"Building sorted entity streams file {archive_path.name}.")
             tmp_path = archive_path.parent / ("tmp." + archive_path.name)
             revisions = list(entity_streams_file.iter_revisions())
-            revisions.sort(key=lambda rev: rev.revision_id)
-            with SevenZipArchive(tmp_path).write() as fd:
+            revisions.sort(key=attrgetter("revision_id"))
+            with SevenZipArchive(tmp_path).write_bytes() as fd:
                 for revision in revisions:
-                    fd.write(revision.json() + "\n")
+                    fd.write(revision.to_json_bytes() + b"\n")
             tmp_path.rename(archive_path)
             _LOGGER.debug(
                 f"Done building sorted entity streams file {archive_path.name}."
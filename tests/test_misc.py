@@ -0,0 +1,65 @@
+#
+# Copyright 2021-2022 Lukas Schmelzeisen
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+from threading import current_thread
+from typing import Iterator, MutableSequence
+
+from pytest import raises
+
+from wikidated._utils import iter_in_background_thread
+
+
+def test_iter_in_background_thread() -> None:
+    assert list(iter_in_background_thread(range(100), 3)) == list(range(100))
+
+
+def test_iter_in_background_thread_empty() -> None:
+    assert list(iter_in_background_thread([], 3)) == []
+
+
+def test_iter_in_background_thread_exception() -> None:
+    def iterable() -> Iterator[int]:
+        yield 1
+        yield 2
+        raise ValueError("failed producing")
+
+    items = []
+    with raises(ValueError, match="failed producing"):
+        for item in iter_in_background_thread(iterable(), 3):
+            items.append(item)
+    assert items == [1, 2]
+
+
+def test_iter_in_background_thread_close() -> None:
+    closed_in_threads: MutableSequence[str] = []
+
+    def iterable() -> Iterator[int]:
+        try:
+            i = 0
+            while True:
+                yield i
+                i += 1
+        finally:
+            closed_in_threads.append(current_thread().name)
+
+    items = iter_in_background_thread(iterable(), 3)
+    assert next(items) == 0
+    assert next(items) == 1
+    items.close()
+    # The source is closed by the producing thread before close() returns.
+    assert len(closed_in_threads) == 1
+    assert closed_in_threads[0] != current_thread().name
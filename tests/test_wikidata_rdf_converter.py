@@ -0,0 +1,82 @@
+#
+# Copyright 2021-2022 Lukas Schmelzeisen
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+from typing import Sequence
+
+from wikidated.wikidata import WikidataRdfTriple
+from wikidated.wikidata.wikidata_rdf_converter import (
+    WIKIDATA_RDF_PREFIXES,
+    WikidataRdfConverter,
+)
+
+
+def _prefix_ntriples_iri_reference(iri: str) -> str:
+    if not iri.startswith("<"):
+        return iri
+    prefix_iris = [
+        prefix_iri
+        for prefix_iri in WIKIDATA_RDF_PREFIXES
+        if iri[1:-1].startswith(prefix_iri)
+    ]
+    if not prefix_iris:
+        return iri
+    prefix_iri = max(prefix_iris, key=len)
+    return f"{WIKIDATA_RDF_PREFIXES[prefix_iri]}:{iri[len(prefix_iri) + 1 : -1]}"
+
+
+def _make_ntriples_iris() -> Sequence[str]:
+    iris = []
+    for prefix_iri in WIKIDATA_RDF_PREFIXES:
+        iris.append(f"<{prefix_iri}>")
+        iris.append(f"<{prefix_iri}Q42>")
+        iris.append(f"<{prefix_iri}P31-value/normalized>")
+        iris.append(f"<{prefix_iri[:-1]}>")
+        iris.append(f"<{prefix_iri[:-1]}x>")
+    return iris
+
+
+def test_triple_with_empty_object() -> None:
+    triple = WikidataRdfTriple("wd:Q1", "rdfs:label", "")
+    assert hash(triple) == hash(WikidataRdfTriple("wd:Q1", "rdfs:label", ""))
+    assert triple == WikidataRdfTriple("wd:Q1", "rdfs:label", "")
+    assert triple != WikidataRdfTriple("wd:Q1", "rdfs:label", "_:node1")
+    assert WikidataRdfTriple("wd:Q1", "rdfs:label", "_:node1") != triple
+
+
+def test_prefix_ntriples_iri_matches_longest_prefix() -> None:
+    for iri in _make_ntriples_iris():
+        assert WikidataRdfConverter._prefix_ntriples_iri(
+            iri
+        ) == _prefix_ntriples_iri_reference(iri)
+
+
+def test_prefix_ntriples_iri_nested_prefixes() -> None:
+    prefix_iri = WikidataRdfConverter._prefix_ntriples_iri
+    assert prefix_iri("<http://www.wikidata.org/entity/Q42>") == "wd:Q42"
+    assert prefix_iri("<http://www.wikidata.org/prop/direct/P31>") == "wdt:P31"
+    assert (
+        prefix_iri("<http://www.wikidata.org/prop/direct-normalized/P31>") == "wdtn:P31"
+    )
+    assert prefix_iri("<http://www.wikidata.org/prop/P31>") == "p:P31"
+    assert prefix_iri("<http://www.wikidata.org/prop/statement/P31>") == "ps:P31"
+    assert prefix_iri("<http://www.wikidata.org/prop/qualifier/P31>") == "pq:P31"
+    assert prefix_iri("<http://www.wikidata.org/prop/qualifier/value/P31>") == "pqv:P31"
+    assert prefix_iri("<http://www.wikidata.org/entity/>") == "wd:"
+    assert prefix_iri("<http://example.org/Q42>") == "<http://example.org/Q42>"
+    assert prefix_iri('"<http://www.wikidata.org/entity/Q42>"@en') == (
+        '"<http://www.wikidata.org/entity/Q42>"@en'
+    )
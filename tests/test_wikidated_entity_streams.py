@@ -0,0 +1,72 @@
+#
+# Copyright 2021-2022 Lukas Schmelzeisen
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+from random import Random
+from typing import AbstractSet, Mapping, Sequence, Tuple
+
+from wikidated.wikidata import WikidataRdfTriple
+from wikidated.wikidated_entity_streams import _diff_triples, _TripleKey
+
+
+def _make_revisions_triples() -> Sequence[Sequence[WikidataRdfTriple]]:
+    random = Random(42)
+    revisions_triples = []
+    for revision in range(20):
+        triples = [
+            WikidataRdfTriple("wd:Q1", f"wdt:P{random.randrange(10)}", f'"v{i}"')
+            for i in range(random.randrange(50))
+        ]
+        # WDTK assigns fresh IDs to blank nodes whenever RDF is generated.
+        triples += [
+            WikidataRdfTriple(f"wds:Q1-{i}", "wikibase:rank", f"_:node{revision}x{i}")
+            for i in range(random.randrange(5))
+        ]
+        # Two triples that only differ in their blank node are equal.
+        triples.append(WikidataRdfTriple("wds:Q1-0", "wikibase:rank", "_:dup"))
+        random.shuffle(triples)
+        revisions_triples.append(triples)
+    return revisions_triples
+
+
+def _diff_triples_with_sets(
+    revisions_triples: Sequence[Sequence[WikidataRdfTriple]],
+) -> Sequence[Tuple[Sequence[WikidataRdfTriple], Sequence[WikidataRdfTriple]]]:
+    diffs = []
+    state: AbstractSet[WikidataRdfTriple] = set()
+    for triples in revisions_triples:
+        triples_set = set(triples)
+        diffs.append((sorted(state - triples_set), sorted(triples_set - state)))
+        state = triples_set
+    return diffs
+
+
+def _as_tuples(
+    triples: Sequence[WikidataRdfTriple],
+) -> Sequence[Tuple[str, str, str]]:
+    return [(subject, predicate, object_) for subject, predicate, object_ in triples]
+
+
+def test_diff_triples_matches_set_difference() -> None:
+    revisions_triples = _make_revisions_triples()
+    state: Mapping[_TripleKey, WikidataRdfTriple] = {}
+    for triples, (expected_deletions, expected_additions) in zip(
+        revisions_triples, _diff_triples_with_sets(revisions_triples)
+    ):
+        triple_deletions, triple_additions, state = _diff_triples(state, triples)
+        # Compare as plain tuples, so that differing blank nodes are detected as well.
+        assert _as_tuples(triple_deletions) == _as_tuples(expected_deletions)
+        assert _as_tuples(triple_additions) == _as_tuples(expected_additions)
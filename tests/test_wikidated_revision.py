@@ -0,0 +1,72 @@
+#
+# Copyright 2021-2022 Lukas Schmelzeisen
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+from datetime import datetime, timezone
+from json import loads
+from typing import Sequence, Union
+
+from wikidated.wikidata import WikidataRdfTriple
+from wikidated.wikidated_revision import WikidatedRevision
+
+
+def _make_revision() -> WikidatedRevision:
+    return WikidatedRevision(
+        entity_id="Q42",
+        page_id=138,
+        namespace=0,
+        redirect=None,
+        revision_id=1234,
+        parent_revision_id=None,
+        timestamp=datetime(2021, 6, 1, 12, 30, 5, tzinfo=timezone.utc),
+        contributor="Zoë 東京",
+        contributor_id=None,
+        is_minor=True,
+        comment='/* wbsetlabel-add:1|de */ Douglas Adams "\\ äöü',
+        wikibase_model="wikibase-item",
+        wikibase_format="application/json",
+        sha1=None,
+        triple_deletions=[
+            WikidataRdfTriple("wd:Q42", "rdfs:label", '"Douglas Adams"@en'),
+            WikidataRdfTriple("wds:Q42-1", "wikibase:rank", "_:node1f8mm5pv5x4125"),
+        ],
+        triple_additions=[
+            WikidataRdfTriple("wd:Q42", "rdfs:label", '"ダグラス・アダムズ"@ja'),
+        ],
+    )
+
+
+def test_to_json_bytes_matches_json() -> None:
+    revision = _make_revision()
+    assert loads(revision.to_json_bytes()) == loads(revision.json())
+
+
+def test_from_json_bytes_round_trip() -> None:
+    revision = _make_revision()
+    serialized_revisions: Sequence[Union[bytes, str]] = [
+        revision.to_json_bytes(),
+        revision.json(),
+    ]
+    for serialized in serialized_revisions:
+        parsed = WikidatedRevision.from_json_bytes(serialized)
+        assert parsed == revision
+        assert parsed.timestamp.tzinfo is not None
+        assert parsed.timestamp.utcoffset() == revision.timestamp.utcoffset()
+        for triple in (*parsed.triple_deletions, *parsed.triple_additions):
+            assert isinstance(triple, WikidataRdfTriple)
+        assert [tuple(triple) for triple in parsed.triple_deletions] == [
+            tuple(triple) for triple in revision.triple_deletions
+        ]